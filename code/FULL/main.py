@@ -1,9 +1,26 @@
+import atexit
 import sys
 import os
-import json
+import pprint
 from datetime import datetime
 from pathlib import Path
 
+# JSON 解析/序列化：优先 orjson（快 3-6 倍），其次 ujson，最后退回标准库
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+
+def _json_dumps_bytes(obj) -> bytes:
+    """序列化为 bytes（带缩进），抹平 orjson/ujson/json 的接口差异"""
+    if _json.__name__ == "orjson":
+        return _json.dumps(obj, option=_json.OPT_INDENT_2)
+    return _json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 # 把上级目录加到 sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -28,8 +45,7 @@ Path(CACHE_DIR).mkdir(parents=True, exist_ok=True)
 
 def load_cache():
     try:
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _json.loads(Path(CACHE_FILE).read_bytes())
     except FileNotFoundError:
         return {}
     except Exception:
@@ -37,17 +53,14 @@ def load_cache():
 
 
 def save_cache(cache):
-    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    Path(CACHE_FILE).write_bytes(_json_dumps_bytes(cache))
 
 
 def is_wordinfo_empty(word_info):
     pos = word_info.get("partOfSpeech", [])
-    if isinstance(pos, list):
-        for p in pos:
-            if isinstance(p, dict) and p.get("wordPrototype", None) == "":
-                return True
-    return False
+    return isinstance(pos, list) and any(
+        isinstance(p, dict) and p.get("wordPrototype", None) == "" for p in pos
+    )
 
 
 # ---------- step1: 遍历../../data/source中所有csv，转化为list[dict] ----------
@@ -58,24 +71,32 @@ old_word_dict_list = save.load_latest_dict_list(folder="../../data/backup/notes"
 full_word_dict_list = save.merge_and_deduplicate(old_list=old_word_dict_list, new_list=word_dict_list)
 new_word_dict_list = save.diff_new_vs_old(old_word_dict_list, word_dict_list)
 
-# 去掉text两边的空格
-for new_word_dict in new_word_dict_list:
-    if isinstance(new_word_dict.get('text'), str):
-        new_word_dict['text'] = new_word_dict['text'].strip()
-    if isinstance(new_word_dict.get('notes'), str):
-        new_word_dict['notes'] = new_word_dict['notes'].strip()
+# full_word_dict_list 中已有的 text 集合，供交互环节 O(1) 去重
+full_texts = {d.get('text') for d in full_word_dict_list if isinstance(d, dict)}
+
+# text/notes 的空白已在 vcs.get_csv_info 读入时清理
 
 # ---------- step3: 查询单词信息，构建 new_word_info_list ----------
 old_word_info_list = save.load_latest_dict_list(folder="../../data/backup/info")
 
 new_word_info_list = []
+
+# 先用 nlp.pipe 批量分析所有句子，比逐句调用 spaCy 快得多
+nlp_pairs = [
+    (d.get('notes'), d.get('text'))
+    for d in new_word_dict_list
+    if isinstance(d.get('notes'), str) and d.get('notes')
+]
+proto_by_pair = dict(zip(nlp_pairs, NLP.analyze_words(nlp_pairs))) if nlp_pairs else {}
+
 for new_word_dict in tqdm(new_word_dict_list, desc="处理单词", unit="词"):
     new_word = new_word_dict.get('text')
     sentence = new_word_dict.get('notes')
     if sentence:
-        print("\n"+sentence)
-    # NLP 尝试分析出原型
-    new_word_ori = NLP.analyze_word(sentence, new_word) if sentence else None
+        # tqdm.write 与进度条协作，不会把进度条刷花
+        tqdm.write(sentence)
+    # NLP 尝试分析出原型（批量结果查表）
+    new_word_ori = proto_by_pair.get((sentence, new_word)) if sentence else None
     if new_word_ori is not None:
         word_info = dict_.get_word_info(new_word_ori)
     else:
@@ -86,35 +107,51 @@ for new_word_dict in tqdm(new_word_dict_list, desc="处理单词", unit="词"):
 
 # ---------- 新增功能1：对非 empty 的 word_info 先自动更新到 Anki，并保存相应的 notes/info json（在交互前） ----------
 cache = load_cache()
+cache_dirty = False
+# 进程退出时统一写 cache（含 Ctrl-C），交互中不再每次确认都全量重写
+atexit.register(lambda: save_cache(cache) if cache_dirty else None)
 auto_saved_notes = []
 auto_saved_info = []
 
-# 将未空的先处理掉（自动导入 Anki 并加入待保存列表）
-for wi in list(new_word_info_list):
-    if not is_wordinfo_empty(wi):
-        # 更新 Anki
-        try:
-            out = anki.update_anki_full(deck, wi)
-        except Exception as e:
-            out = f"anki update failed: {e}"
-        # 收集要保存的 notes（从 sentences 中取出原始 note）
-        notes_from_sentences = [s for s in wi.get('sentences', []) if isinstance(s, dict)]
-        auto_saved_notes.append(notes_from_sentences[0])
-        # 收集 info（避免重复）
-        prototype = None
-        pos = wi.get('partOfSpeech', [])
-        if isinstance(pos, list) and len(pos) > 0 and isinstance(pos[0], dict):
-            prototype = pos[0].get('wordPrototype', None)
-        if prototype is None:
-            # 尝试从 word_info 顶级字段获取
-            prototype = wi.get('wordPrototype')
-        if prototype is not None:
-            if not any((existing.get('partOfSpeech') and isinstance(existing.get('partOfSpeech'), list)
-                        and existing.get('partOfSpeech')[0].get('wordPrototype') == prototype)
-                    for existing in old_word_info_list + auto_saved_info):
-                        auto_saved_info.append(wi)
-        # 从 new_word_info_list 中移除（因为已经处理）
-        new_word_info_list.remove(wi)
+# 已保存过的 wordPrototype 集合，替代对 old+auto 列表的重复线性扫描
+seen_prototypes = {
+    wi['partOfSpeech'][0].get('wordPrototype')
+    for wi in old_word_info_list
+    if isinstance(wi.get('partOfSpeech'), list) and wi.get('partOfSpeech')
+    and isinstance(wi['partOfSpeech'][0], dict)
+}
+
+# 将未空的先处理掉（收集后批量导入 Anki 并加入待保存列表）
+# 单次遍历拆成“已处理/剩余”两个列表，避免在迭代中 remove 的 O(N²) 扫描
+auto_update_batch = []
+remaining_word_info_list = []
+for wi in new_word_info_list:
+    if is_wordinfo_empty(wi):
+        remaining_word_info_list.append(wi)
+        continue
+    auto_update_batch.append(wi)
+    # 收集要保存的 notes（从 sentences 中取出原始 note）
+    notes_from_sentences = [s for s in wi.get('sentences', []) if isinstance(s, dict)]
+    auto_saved_notes.append(notes_from_sentences[0])
+    # 收集 info（避免重复）
+    prototype = None
+    pos = wi.get('partOfSpeech', [])
+    if isinstance(pos, list) and len(pos) > 0 and isinstance(pos[0], dict):
+        prototype = pos[0].get('wordPrototype', None)
+    if prototype is None:
+        # 尝试从 word_info 顶级字段获取
+        prototype = wi.get('wordPrototype')
+    if prototype is not None and prototype not in seen_prototypes:
+        seen_prototypes.add(prototype)
+        auto_saved_info.append(wi)
+new_word_info_list = remaining_word_info_list
+
+# 用一次 multi 请求批量更新 Anki，而不是每个单词一次 HTTP
+if auto_update_batch:
+    try:
+        anki.update_anki_full_batch(deck, auto_update_batch)
+    except Exception as e:
+        print(f"anki batch update failed: {e}")
 
 # 立刻保存自动处理的 notes 和 info 到 backup（追加到旧列表并保存）
 if auto_saved_notes:
@@ -127,20 +164,16 @@ if auto_saved_info:
 
 # ---------- 新增功能2：为 empty words 增加交互前的 cache 检查/自动复用/保存 cache 功能 ----------
 
-# 排序 & 收集空 wordPrototype 的 text（保持原逻辑，但此时 new_word_info_list 不包含之前自动处理的项）
-empty_word_texts = []
-
-def word_prototype_empty_first(item):
-    pos = item.get("partOfSpeech", [])
-    if isinstance(pos, list):
-        for p in pos:
-            if isinstance(p, dict) and p.get("wordPrototype") == "":
-                texts = [s.get("text") for s in item.get("sentences", []) if isinstance(s, dict)]
-                empty_word_texts.extend(texts)
-                return 0
-    return 1
-
-new_word_info_list = sorted(new_word_info_list, key=word_prototype_empty_first)
+# 排序 & 收集空 wordPrototype 的 text：先一次性算好空标记再排序，
+# 不再把副作用塞进 sort key（sort key 会按比较次数反复执行）
+annotated = [(0 if is_wordinfo_empty(wi) else 1, wi) for wi in new_word_info_list]
+annotated.sort(key=lambda pair: pair[0])
+new_word_info_list = [wi for _, wi in annotated]
+empty_word_texts = [
+    s.get("text")
+    for flag, wi in annotated if flag == 0
+    for s in wi.get("sentences", []) if isinstance(s, dict)
+]
 
 # 交互式处理剩下的空单词
 for index, word_info in enumerate(new_word_info_list):
@@ -157,7 +190,6 @@ for index, word_info in enumerate(new_word_info_list):
     if cached:
         # 询问是否使用 cache
         print(f"发现缓存（{CACHE_FILE}）中的候选：")
-        import pprint
         pprint.pprint(cached)
         use_cache = input("是否使用缓存中的词条？输入 y 使用 / n 继续手动输入（默认 y）：").strip().lower()
         if use_cache != 'n':
@@ -176,17 +208,14 @@ for index, word_info in enumerate(new_word_info_list):
                 out = f"anki update failed: {e}"
             # 保存到已处理的 notes/info
             for n in word_info.get('sentences', []):
-                if not any(existing.get('text') == n.get('text') for existing in full_word_dict_list):
+                if n.get('text') not in full_texts:
                     full_word_dict_list.append(n)
-            if not any((existing.get('partOfSpeech') and isinstance(existing.get('partOfSpeech'), list)
-                        and existing.get('partOfSpeech')[0].get('wordPrototype') == word_info['partOfSpeech'][0].get('wordPrototype'))
-                       for existing in old_word_info_list + auto_saved_info):
+                    full_texts.add(n.get('text'))
+            proto = word_info['partOfSpeech'][0].get('wordPrototype')
+            if proto not in seen_prototypes:
+                seen_prototypes.add(proto)
                 auto_saved_info.append(word_info)
-            # 保存 auto lists 到 disk（追加保存）
-            if auto_saved_notes:
-                save.save_dict_list(old_word_dict_list + auto_saved_notes, folder="../../data/backup/notes")
-            if auto_saved_info:
-                save.save_dict_list(old_word_info_list + auto_saved_info, folder="../../data/backup/info")
+            # 不再每个缓存命中都全量重写 backup 文件，统一由脚本末尾的最终保存落盘
             # 跳至下一个
             continue
 
@@ -234,7 +263,6 @@ for index, word_info in enumerate(new_word_info_list):
             continue
 
         print("\n=== 预览 ===")
-        import pprint
         pprint.pprint(preview)
         print("============\n")
 
@@ -252,9 +280,9 @@ for index, word_info in enumerate(new_word_info_list):
             else:
                 word_info["partOfSpeech"] = [new_word_info]
 
-            # 把此条写入 cache，便于下次复用
+            # 把此条写入 cache，便于下次复用（退出时统一落盘）
             cache[text_str] = new_word_info
-            save_cache(cache)
+            cache_dirty = True
 
             # 更新 Anki
             try:
@@ -265,11 +293,12 @@ for index, word_info in enumerate(new_word_info_list):
 
             # 添加到 full_word_dict_list（notes）和 auto_saved_info（info）以便后续统一保存
             for n in word_info.get('sentences', []):
-                if not any(existing.get('text') == n.get('text') for existing in full_word_dict_list):
+                if n.get('text') not in full_texts:
                     full_word_dict_list.append(n)
-            if not any((existing.get('partOfSpeech') and isinstance(existing.get('partOfSpeech'), list)
-                        and existing.get('partOfSpeech')[0].get('wordPrototype') == word_info['partOfSpeech'][0].get('wordPrototype'))
-                       for existing in old_word_info_list + auto_saved_info):
+                    full_texts.add(n.get('text'))
+            proto = word_info['partOfSpeech'][0].get('wordPrototype')
+            if proto not in seen_prototypes:
+                seen_prototypes.add(proto)
                 auto_saved_info.append(word_info)
 
             # 退出当前单词处理
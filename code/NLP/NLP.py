@@ -1,9 +1,44 @@
+import functools
+
 import spacy
-nlp = spacy.load("en_core_web_sm")
+
+# 延迟加载：模型加载约 1 秒、常驻 ~50MB，没有新词时完全用不到
+_nlp = None
+
+
+def get_nlp():
+    """按需加载 spaCy 模型；只需要 tagger + lemmatizer，禁用 ner/parser"""
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load("en_core_web_sm", disable=["ner", "parser"])
+    return _nlp
+
+
+def analyze_words(pairs, batch_size=64):
+    """
+    批量版 analyze_word：输入 (sentence, target_word) 列表，
+    用 nlp.pipe 一次性跑完所有句子，返回与输入等长的原型列表。
+    """
+    pairs = list(pairs)
+    results = []
+    docs = get_nlp().pipe((sentence for sentence, _ in pairs), batch_size=batch_size)
+    for doc, (_, target_word) in zip(docs, pairs):
+        target = target_word.casefold()
+        result = None
+        for token in doc:
+            if token.text.casefold() == target:
+                result = token.lemma_ if token.pos_ == "VERB" else token.text
+                break
+        results.append(result)
+    return results
+
+
+@functools.lru_cache(maxsize=8192)
 def analyze_word(sentence, target_word):
-    doc = nlp(sentence)
+    target = target_word.casefold()
+    doc = get_nlp()(sentence)
     for token in doc:
-        if token.text.lower() == target_word.lower():
+        if token.text.casefold() == target:
             print(f"单词: {token.text}")
             print(f"词性: {token.pos_}")  # 例如 VERB, ADJ, NOUN...
             print(f"词形还原: {token.lemma_}")  # 原型
@@ -11,4 +46,4 @@ def analyze_word(sentence, target_word):
                 return token.lemma_  # 查原型
             else:
                 return token.text  # 查现在的形式
-    return None
\ No newline at end of file
+    return None
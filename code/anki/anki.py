@@ -9,20 +9,49 @@ Anki 导入与更新脚本:
 需要 AnkiConnect（http://localhost:8765）和已打开的 Anki 客户端。
 """
 import os
-import base64
+import binascii
+import copy
+import functools
 import hashlib
 import requests
 import sys
 import html
 import re
+import sqlite3
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from typing import Dict, Any, List, Tuple
+
+# 请求体序列化：orjson 为 C 实现、直接产出 bytes；缺席时退回 requests 内置的 json
+try:
+    import orjson as _fastjson
+except ImportError:
+    _fastjson = None
 os.environ['NO_PROXY'] = 'localhost,127.0.0.1'
 
 # ==================== 配置项 ====================
 ANKI_CONNECT_URL = "http://localhost:8765"
+# 批量导入时可设 ANKI_VERBOSE=0 静默进度输出；错误信息始终打印
+VERBOSE = os.environ.get("ANKI_VERBOSE", "1") == "1"
+
+
+def _log(*args, **kwargs):
+    if VERBOSE:
+        print(*args, **kwargs)
+
+
+
 MODEL_NAME = "WordType"  # Note type name used when creating Anki model
 REQUEST_TIMEOUT = 2.0
+# AnkiConnect 走本机回环：建连应当瞬时完成，读超时给 addNote/storeMediaFile
+# 这类较重的动作留足余量；挂住时快速失败并重试。
+# 慢机器可通过环境变量 ANKI_REQUEST_TIMEOUT 放宽读超时（秒）
+CONNECT_TIMEOUT = 0.2
+READ_TIMEOUT = float(os.environ.get("ANKI_REQUEST_TIMEOUT", 5.0))
+_RETRY_BACKOFFS = (0.1, 0.3, 0.9)
 AUDIO_HTTP_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -56,31 +85,91 @@ input[type=text] { font-family: inherit; font-size: 20px; text-align: center; bo
 """
 # ================================================
 
+# 模块级 Session：所有 AnkiConnect 调用复用同一条 keep-alive 连接，
+# 免去每次请求的 TCP 建连/拆连开销；https 侧给音频下载复用（省 TLS 握手）
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive"})
+_SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8))
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+
 def invoke(action: str, **params):
-    """向 AnkiConnect 发送请求的辅助函数"""
-    try:
-        r = requests.post(
-            ANKI_CONNECT_URL,
-            json={"action": action, "version": 6, "params": params},
-            timeout=REQUEST_TIMEOUT
-        )
-        r.raise_for_status()
-        response_json = r.json()
-        if response_json.get("error"):
-            print(f"[AnkiConnect 错误] Action: {action}, Error: {response_json['error']}")
-        return response_json
-    except requests.RequestException as e:
-        print(f"[错误] 无法连接 AnkiConnect ({ANKI_CONNECT_URL}): {e}")
-        # 抛出异常而不是直接退出，让调用方处理
-        raise
+    """向 AnkiConnect 发送请求的辅助函数（超时时按指数退避重试）"""
+    payload = {"action": action, "version": 6, "params": params}
+    last_timeout = None
+    for backoff in _RETRY_BACKOFFS:
+        try:
+            if _fastjson is not None:
+                r = _SESSION.post(
+                    ANKI_CONNECT_URL,
+                    data=_fastjson.dumps(payload),
+                    headers={"Content-Type": "application/json"},
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+                )
+            else:
+                r = _SESSION.post(ANKI_CONNECT_URL, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            r.raise_for_status()
+            response_json = _fastjson.loads(r.content) if _fastjson is not None else r.json()
+            if response_json.get("error"):
+                print(f"[AnkiConnect 错误] Action: {action}, Error: {response_json['error']}")
+            return response_json
+        except requests.exceptions.Timeout as e:
+            last_timeout = e
+            time.sleep(backoff)
+        except requests.RequestException as e:
+            print(f"[错误] 无法连接 AnkiConnect ({ANKI_CONNECT_URL}): {e}")
+            # 抛出异常而不是直接退出，让调用方处理
+            raise
+    print(f"[错误] AnkiConnect 请求多次超时 (Action: {action})")
+    raise last_timeout
+
+
+def invoke_multi(actions: List[Dict[str, Any]]) -> List[Any]:
+    """用 multi 动作把多个 AnkiConnect 请求合并为一次 HTTP 往返"""
+    if not actions:
+        return []
+    res = invoke("multi", actions=actions)
+    return res.get("result") or []
+
+
+def _multi_action(action: str, **params) -> Dict[str, Any]:
+    """构造 multi 动作里的单个子请求"""
+    return {"action": action, "version": 6, "params": params}
+
+
+# modelNames 结果的进程内缓存：批量导入期间模型列表几乎不变
+_MODEL_NAMES_TTL = 5.0
+_model_names_cache = None  # (获取时间, 名称列表)
+
+
+def get_model_names(force: bool = False) -> List[str]:
+    """返回 modelNames 结果，带 TTL 缓存，避免每个单词都发一次请求"""
+    global _model_names_cache
+    now = time.time()
+    if force or _model_names_cache is None or now - _model_names_cache[0] > _MODEL_NAMES_TTL:
+        names = invoke("modelNames").get("result") or []
+        _model_names_cache = (now, names)
+    return _model_names_cache[1]
+
+
+# 文件名白名单外的 ASCII 字符统一映射为下划线；非 ASCII 走正则兜底
+_FILENAME_KEEP = set(string.ascii_letters + string.digits + "_-")
+_FILENAME_TABLE = str.maketrans({chr(b): '_' for b in range(128) if chr(b) not in _FILENAME_KEEP})
+_NON_FILENAME_RE = re.compile(r'[^A-Za-z0-9_-]+')
 
 
 def sanitize_media_filename(value: str) -> str:
     """将字符串转换为适合作为媒体文件名的安全形式"""
     if not value:
         return "audio"
-    sanitized = re.sub(r'[^A-Za-z0-9_-]+', '_', value).strip('_')
-    return sanitized.lower() or "audio"
+    if value.isascii():
+        sanitized = value.translate(_FILENAME_TABLE)
+        # 连续下划线压成一个，和正则把整段非法字符替换为单个 '_' 一致
+        while '__' in sanitized:
+            sanitized = sanitized.replace('__', '_')
+    else:
+        sanitized = _NON_FILENAME_RE.sub('_', value)
+    return sanitized.strip('_').lower() or "audio"
 
 
 def infer_audio_extension(url: str, content_type: str) -> str:
@@ -118,28 +207,30 @@ def ensure_pronunciation_audio(word_info: Dict[str, Any]) -> str:
         if not part_of_speech:
             return ""
 
+        # 找到第一个美音直接收工；英音只在完全没有美音时兜底
         preferred_url = ""
         fallback_url = ""
         for pos in part_of_speech:
-            us_url = ((pos or {}).get("pronunciationUS") or {}).get("pronUrl") or ""
-            uk_url = ((pos or {}).get("pronunciationUK") or {}).get("pronUrl") or ""
-            if us_url and not preferred_url:
+            if not pos:
+                continue
+            us_url = (pos.get("pronunciationUS") or _EMPTY).get("pronUrl")
+            if us_url:
                 preferred_url = us_url
+                break
+            uk_url = (pos.get("pronunciationUK") or _EMPTY).get("pronUrl")
             if uk_url and not fallback_url:
                 fallback_url = uk_url
-            if preferred_url:
-                break
 
         audio_url = preferred_url or fallback_url
         if not audio_url:
             return ""
-        
+
         base_word = (
             (part_of_speech[0] or {}).get("wordPrototype")
             or word_info.get("word")
             or "audio"
         )
-        suffix = "-us" if audio_url == preferred_url and preferred_url else "-uk"
+        suffix = "-us" if preferred_url else "-uk"
         
         # 调用 get_audio，它已经有完善的错误处理
         return get_audio(audio_url, suffix, base_word)
@@ -150,32 +241,97 @@ def ensure_pronunciation_audio(word_info: Dict[str, Any]) -> str:
         traceback.print_exc()
         return ""
 
+# ---- 音频 URL → 媒体文件名 的持久缓存 ----
+# 音频补齐是幂等的：同一 URL 之前已存入媒体库的话，重跑时直接短路，
+# 不下载也不再 storeMediaFile，增量运行只为新笔记付出代价
+_AUDIO_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache.sqlite3")
+_audio_cache_conn = None
+_audio_cache_lock = threading.Lock()
+
+
+def _audio_cache() -> sqlite3.Connection:
+    global _audio_cache_conn
+    if _audio_cache_conn is None:
+        conn = sqlite3.connect(_AUDIO_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS audio_cache(url TEXT PRIMARY KEY, filename TEXT)")
+        conn.commit()
+        _audio_cache_conn = conn
+    return _audio_cache_conn
+
+
+def lookup_cached_audio(audio_url: str) -> str:
+    """查 URL 缓存；命中且媒体库确实还有该文件时返回文件名，否则返回空串"""
+    with _audio_cache_lock:
+        row = _audio_cache().execute(
+            "SELECT filename FROM audio_cache WHERE url=?", (audio_url,)
+        ).fetchone()
+    if not row:
+        return ""
+    filename = row[0]
+    try:
+        # getMediaFilesNames 只回文件名列表，比 retrieveMediaFile 轻得多
+        if invoke("getMediaFilesNames", pattern=filename).get("result"):
+            return filename
+    except requests.RequestException:
+        pass
+    return ""
+
+
+def remember_cached_audio(audio_url: str, filename: str) -> None:
+    """记录一次成功的 storeMediaFile，供后续运行短路"""
+    with _audio_cache_lock:
+        conn = _audio_cache()
+        conn.execute("INSERT OR REPLACE INTO audio_cache(url, filename) VALUES(?, ?)",
+                     (audio_url, filename))
+        conn.commit()
+
+
+def download_audio_bytes(audio_url: str, session: "requests.Session" = None) -> Tuple[bytearray, str]:
+    """
+    流式下载音频：按 64KB 块收进一个 bytearray，峰值内存只保留一份缓冲，
+    不像 resp.content 那样整体物化后再复制。anki 与 update 两条音频路径共用。
+    失败时抛 requests.RequestException，由调用方处理。
+    返回 (音频字节, Content-Type)。
+    """
+    resp = (session or _SESSION).get(
+        audio_url,
+        timeout=max(REQUEST_TIMEOUT, 5),
+        headers=AUDIO_HTTP_HEADERS,
+        stream=True,
+    )
+    resp.raise_for_status()
+    buf = bytearray()
+    for chunk in resp.iter_content(65536):
+        buf.extend(chunk)
+    return buf, resp.headers.get("Content-Type", "")
+
+
 def get_audio(audio_url: str, suffix:str, base_word:str) -> str:
     """
     下载音频并存储到 Anki 媒体库，返回 [sound:...] 标记
     包含完善的错误处理和验证，确保文件真正存储成功
     """
+    # 0. 同一 URL 之前已经入库的话直接复用
+    cached = lookup_cached_audio(audio_url)
+    if cached:
+        return f"[sound:{cached}]"
+
     # 1. 下载音频
     try:
-        resp = requests.get(
-            audio_url,
-            timeout=max(REQUEST_TIMEOUT, 5),
-            headers=AUDIO_HTTP_HEADERS,
-        )
-        resp.raise_for_status()
+        audio_bytes, content_type = download_audio_bytes(audio_url)
     except requests.RequestException as exc:
         print(f"[音频] 下载失败: {audio_url} ({exc})")
         return ""
 
     # 2. 推断文件扩展名
-    extension = infer_audio_extension(audio_url, resp.headers.get("Content-Type", ""))
-    
+    extension = infer_audio_extension(audio_url, content_type)
+
     # 3. 生成文件名
-    hash_tail = hashlib.md5(audio_url.encode("utf-8")).hexdigest()[:8]
+    hash_tail = hashlib.blake2b(audio_url.encode("utf-8"), digest_size=4).hexdigest()
     filename = f"{sanitize_media_filename(base_word)}{suffix}-{hash_tail}{extension}"
 
     # 4. 验证下载内容
-    audio_bytes = resp.content
     if not audio_bytes:
         print(f"[音频] 下载内容为空: {audio_url}")
         return ""
@@ -185,9 +341,9 @@ def get_audio(audio_url: str, suffix:str, base_word:str) -> str:
         print(f"[音频] 下载内容过小（{len(audio_bytes)} 字节），可能不是有效的音频文件")
         return ""
 
-    # 5. 编码并存储到 Anki
+    # 5. 编码并存储到 Anki（memoryview 避免 bytearray→bytes 的一次拷贝）
     try:
-        encoded = base64.b64encode(audio_bytes).decode("utf-8")
+        encoded = binascii.b2a_base64(memoryview(audio_bytes), newline=False).decode("ascii")
         store_res = invoke("storeMediaFile", filename=filename, data=encoded)
         
         # 6. 验证存储结果
@@ -207,8 +363,9 @@ def get_audio(audio_url: str, suffix:str, base_word:str) -> str:
             print(f"[音频] 存储失败: result 为 False (文件: {filename})")
             return ""
         
-        # 8. 如果所有验证都通过，返回音频标记
-        print(f"[音频] 成功存储: {filename} ({len(audio_bytes)} 字节)")
+        # 8. 如果所有验证都通过，记入 URL 缓存并返回音频标记
+        remember_cached_audio(audio_url, filename)
+        _log(f"[音频] 成功存储: {filename} ({len(audio_bytes)} 字节)")
         return f"[sound:{filename}]"
         
     except requests.RequestException as e:
@@ -221,12 +378,13 @@ def get_audio(audio_url: str, suffix:str, base_word:str) -> str:
         return ""
 
 
-def get_word_info(word: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=4096)
+def _fetch_word_info(word: str) -> Dict[str, Any]:
     """
     [占位符] 根据单词获取其详细信息。
     请您务必将其替换为您自己的数据获取实现（例如，网络爬虫或API调用）。
     """
-    print(f"--- [模拟] 正在为 '{word}' 获取信息... ---")
+    _log(f"--- [模拟] 正在为 '{word}' 获取信息... ---")
     if "juvenile prison" in word:
         return {
             "word": "juvenile prison",
@@ -249,12 +407,53 @@ def get_word_info(word: str) -> Dict[str, Any]:
                 "bookName": "Example Book"
             }]
         }
-    print(f"--- [模拟] 未找到单词 '{word}' 的信息。 ---")
+    _log(f"--- [模拟] 未找到单词 '{word}' 的信息。 ---")
     return {}
 
 
+def get_word_info(word: str) -> Dict[str, Any]:
+    """
+    同一单词在一次运行里会被查询多次（添加 + 更新路径），结果用 lru_cache
+    记住；真实实现换成网络抓取后，省下的是整次 HTTP 往返。
+    返回深拷贝，调用方可以随意改动而不污染缓存。
+    """
+    return copy.deepcopy(_fetch_word_info(word))
+
+
+
 
 
+# 常量正则统一在模块级预编译，避免热路径里反复走 re 缓存查表
+_POS_TAG_RE = re.compile(r'\s*\[.*?\]\s*')
+
+# 只读空 dict 哨兵：缺键时共用一份，省去 .get(key, {}) 每次分配新 dict
+_EMPTY: Dict[str, Any] = {}
+
+# html.escape 的单遍版本：translate 一趟完成五种字符替换，
+# 用于逐句的热路径；输出与 html.escape(quote=True) 完全一致
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;",
+})
+_NEEDS_ESCAPE = re.compile(r'[&<>"\']')
+
+
+def _esc(s: str) -> str:
+    # 多数书摘句子不含特殊字符：先探测一遍，无命中直接原样返回
+    if _NEEDS_ESCAPE.search(s) is None:
+        return s
+    return s.translate(_HTML_ESCAPE_TABLE)
+
+
+# 例句 HTML 的固定包装片段：模块级常量按引用 append，不用每句重建
+_EX_PREFIX = "<div class='example'><div class='example-text'>"
+_EX_MID = "</div><div class='example-meta'>"
+_EX_SUFFIX = "</div></div>"
+
+# 挖空用的 translate 表：一趟 C 层扫描即可把 ASCII 字母（数字）替换为下划线，
+# 比逐字符 isalpha()/isalnum() 推导快一个数量级；非 ASCII 句子走原推导兜底
+_ALPHA_TABLE = str.maketrans({c: '_' for c in string.ascii_letters})
+_ALNUM_TABLE = str.maketrans({c: '_' for c in string.ascii_letters + string.digits})
+
 
 def replace_alnum_with_underscores(match_obj: re.Match) -> str:
     """
@@ -262,10 +461,73 @@ def replace_alnum_with_underscores(match_obj: re.Match) -> str:
     并将其中的字母和数字替换为下划线。
     """
     word = match_obj.group(0)
+    if word.isascii():
+        return word.translate(_ALNUM_TABLE)
     return ''.join(['_' if char.isalnum() else char for char in word])
 
 
 
+@functools.lru_cache(maxsize=2048)
+def pattern_for_blanking(target: str) -> re.Pattern:
+    """
+    构造目标词挖空用的正则：多词短语不加 \\b（避免边界失配），
+    单词加 \\b 防止误匹配子串。传入原始目标词（不要 html.escape——
+    挖空是在未 escape 的原句上做的）。anki 与 movie 导入流程共用
+    同一份逻辑，同一目标词反复出现时直接命中缓存。
+    """
+    if " " in target:
+        return re.compile(re.escape(target), re.IGNORECASE)
+    return re.compile(r'\b' + re.escape(target) + r'\b', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=2048)
+def _blanked_replacement(target: str) -> str:
+    """
+    固定目标词挖空后的字面替换串：下划线对大小写不敏感，所以同一目标词
+    的所有匹配都能用这一个串直接替换，sub 不再对每个匹配回调 Python 函数。
+    反斜杠转义是为了让结果能安全地作为 re.sub 的替换模板。
+    """
+    if target.isascii():
+        blanked = target.translate(_ALNUM_TABLE)
+    else:
+        blanked = ''.join(['_' if char.isalnum() else char for char in target])
+    return blanked.replace('\\', '\\\\')
+
+
+def _highlight(escaped_sentence: str, escaped_target: str) -> str:
+    """
+    在已 escape 的句子中给目标词加 <strong>。
+    用 str.find 单遍扫描并手工判断字母数字边界，替代 \\b 正则：
+    更快，且不会被紧邻的 HTML 实体干扰边界判断。
+    """
+    if not escaped_target:
+        return escaped_sentence
+    hay = escaped_sentence.lower()
+    needle = escaped_target.lower()
+    n = len(needle)
+    out: List[str] = []
+    pos = 0
+    start = 0
+    while True:
+        i = hay.find(needle, start)
+        if i == -1:
+            break
+        end = i + n
+        if (i == 0 or not hay[i - 1].isalnum()) and (end == len(hay) or not hay[end].isalnum()):
+            out.append(escaped_sentence[pos:i])
+            out.append("<strong>")
+            out.append(escaped_sentence[i:end])
+            out.append("</strong>")
+            pos = end
+            start = end
+        else:
+            start = i + 1
+    if not out:
+        return escaped_sentence
+    out.append(escaped_sentence[pos:])
+    return "".join(out)
+
+
 def blank_out_all_words(sentence: str) -> str:
     """
     将句子中所有单词的英文字母替换为下划线，保留非字母字符（如标点、数字）和空格。
@@ -273,14 +535,48 @@ def blank_out_all_words(sentence: str) -> str:
     """
     if not sentence:
         return ""
-    
-    words = sentence.split(' ')
-    blanked_words = []
-    for word in words:
-        # 对单词中的每个字符进行判断，是字母则替换，否则保留
-        blanked_word = ''.join(['_' if char.isalpha() else char for char in word])
-        blanked_words.append(blanked_word)
-    return ' '.join(blanked_words)
+    # 非字母字符在 translate 表中没有映射、原样透传，无需按空格拆分再拼回
+    if sentence.isascii():
+        return sentence.translate(_ALPHA_TABLE)
+    return ''.join(['_' if char.isalpha() else char for char in sentence])
+
+
+def _render_sentence(
+    s: Dict[str, Any],
+    word_to_highlight: str,
+    meta_cache: Dict[Tuple[str, str], str],
+) -> Tuple[str, str]:
+    """渲染单个例句，返回 (加粗例句块, 挖空例句块)；空句返回 ("", "")"""
+    sentence_text = s.get("notes").strip()
+    if not sentence_text:
+        return "", ""
+
+    # 'Examples': 目标词加粗（单遍 find 扫描，无正则）
+    escaped_sentence = _esc(sentence_text)
+    target_word = s.get("text") or word_to_highlight  # 用于加粗的目标词
+    raw_target = target_word.strip()
+    if raw_target:
+        highlighted = _highlight(escaped_sentence, _esc(raw_target))
+    else:
+        highlighted = escaped_sentence
+
+    # 'Blanked_Examples': 挖空在未 escape 的原句上进行，
+    # 模式也用原始目标词构造（挖空后再整体 escape）
+    blanked_sentence = pattern_for_blanking(raw_target).sub(_blanked_replacement(raw_target), sentence_text)
+    escaped_blanked = _esc(blanked_sentence)
+
+    # 来源信息：同一本书/章节只 escape 一次
+    book = s.get("bookName") or ""
+    chapter = s.get("chapter") or ""
+    meta = meta_cache.get((book, chapter))
+    if meta is None:
+        meta = f" — 《{_esc(book)}》: {_esc(chapter)}" if book else ""
+        meta_cache[(book, chapter)] = meta
+
+    return (
+        "".join((_EX_PREFIX, highlighted, _EX_MID, meta, _EX_SUFFIX)),
+        "".join((_EX_PREFIX, escaped_blanked, _EX_MID, meta, _EX_SUFFIX)),
+    )
 
 
 def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
@@ -291,9 +587,11 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
     pos_html_parts: List[str] = []
     pronunciation_parts: List[str] = []
     definition_parts: List[str] = []
-    examples_parts: List[str] = []
-    blanked_examples_parts: List[str] = []
-    
+
+    # 下方循环里要 escape 几十次：用 translate 版 _esc（输出与
+    # html.escape(quote=True) 一致），并绑定为局部名省去全局查找
+    esc = _esc
+
     word_to_highlight = word_info.get("word", "")
 
     # 按词性分组，合并相同词性的条目，避免重复
@@ -306,7 +604,7 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
         if not pos_type:
             return "Unknown"
         # 去掉方括号及其内容，如 "Noun [ c ]" -> "Noun"
-        base = re.sub(r'\s*\[.*?\]\s*', '', pos_type).strip()
+        base = _POS_TAG_RE.sub('', pos_type).strip()
         return base if base else pos_type.strip()
     
     for pos in word_info.get("partOfSpeech", []):
@@ -319,8 +617,8 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
         if base_pos_type not in pos_dict:
             # 第一次遇到这个词性，直接使用
             pos_dict[base_pos_type] = {
-                "pronunciationUK": pos.get("pronunciationUK", {}),
-                "pronunciationUS": pos.get("pronunciationUS", {}),
+                "pronunciationUK": pos.get("pronunciationUK") or _EMPTY,
+                "pronunciationUS": pos.get("pronunciationUS") or _EMPTY,
                 "definitions": list(pos.get("definitions", [])),
                 "phrases": list(pos.get("phrases", [])),
                 "phraseDefinitions": list(pos.get("phraseDefinitions", []))
@@ -360,8 +658,8 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
                         existing["phraseDefinitions"].append(new_phrase_defs[i])
             
             # 如果当前条目的发音信息更完整，则更新
-            uk = pos.get("pronunciationUK", {})
-            us = pos.get("pronunciationUS", {})
+            uk = pos.get("pronunciationUK") or _EMPTY
+            us = pos.get("pronunciationUS") or _EMPTY
             if (uk.get("phonetic") or uk.get("pronUrl")) and not (existing["pronunciationUK"].get("phonetic") or existing["pronunciationUK"].get("pronUrl")):
                 existing["pronunciationUK"] = uk
             if (us.get("phonetic") or us.get("pronUrl")) and not (existing["pronunciationUS"].get("phonetic") or existing["pronunciationUS"].get("pronUrl")):
@@ -374,27 +672,29 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
         
         # 使用完整的词性字符串（优先使用有标记的）
         display_pos_type = pos_type_map.get(base_pos_type, base_pos_type)
-        pos_title_html = f"<div class='pos-title'>{html.escape(str(display_pos_type)).capitalize()}</div>"
+        pos_title_html = f"<div class='pos-title'>{esc(str(display_pos_type)).capitalize()}</div>"
         part_lines.append(pos_title_html)
         # Definition 字段也包含词性标题
         def_lines.append(pos_title_html)
 
-        # 发音
-        uk = pos_data.get("pronunciationUK") or {}
-        us = pos_data.get("pronunciationUS") or {}
+        # 发音：各字段解包一次成局部变量，不再重复 .get()
+        uk = pos_data.get("pronunciationUK") or _EMPTY
+        us = pos_data.get("pronunciationUS") or _EMPTY
+        uk_p, uk_url = uk.get("phonetic", ""), uk.get("pronUrl", "")
+        us_p, us_url = us.get("phonetic", ""), us.get("pronUrl", "")
+        # 单条 f-string 拼整行，避免循环里的 += 字符串拼接
         audio_lines: List[str] = []
-        if uk.get("phonetic") or uk.get("pronUrl"):
-            aud = f"UK: {html.escape(uk.get('phonetic',''))}"
-            if uk.get("pronUrl"):
-                aud += f" <audio controls src=\"{html.escape(uk.get('pronUrl'))}\"></audio>"
-            audio_lines.append(f"<div class='audio-row'>{aud}</div>")
-        if us.get("phonetic") or us.get("pronUrl"):
-            aud = f"US: {html.escape(us.get('phonetic',''))}"
-            if us.get("pronUrl"):
-                aud += f" <audio controls src=\"{html.escape(us.get('pronUrl'))}\"></audio>"
-            audio_lines.append(f"<div class='audio-row'>{aud}</div>")
+        if uk_p or uk_url:
+            player = f" <audio controls src=\"{esc(uk_url)}\"></audio>" if uk_url else ""
+            audio_lines.append(f"<div class='audio-row'>UK: {esc(uk_p)}{player}</div>")
+        if us_p or us_url:
+            player = f" <audio controls src=\"{esc(us_url)}\"></audio>" if us_url else ""
+            audio_lines.append(f"<div class='audio-row'>US: {esc(us_p)}{player}</div>")
         if audio_lines:
             part_lines.extend(audio_lines)
+            # Pronunciation 字段在同一趟循环里顺带产出，不再为它单独遍历词性
+            pronunciation_parts.append(pos_title_html)
+            pronunciation_parts.extend(audio_lines)
 
         # 定义
         defs = pos_data.get("definitions", [])
@@ -406,8 +706,8 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
                 ch = (d.get("chMeaning") or d.get("ch") or "").strip()
                 def_item = (
                     "<li>"
-                    f"<div class='definition-en'>{html.escape(en)}</div>"
-                    f"<div class='definition-ch'>{html.escape(ch)}</div>"
+                    f"<div class='definition-en'>{esc(en)}</div>"
+                    f"<div class='definition-ch'>{esc(ch)}</div>"
                     "</li>"
                 )
                 part_lines.append(def_item)
@@ -426,8 +726,8 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
                 ch = (pd.get("chMeaning") or pd.get("ch") or "").strip()
                 phrase_block.append(
                     "<li>"
-                    f"<span class='phrase'>{html.escape(ph)}</span> — <span class='definition-en'>{html.escape(en)}</span>"
-                    f"<div class='definition-ch'>{html.escape(ch)}</div>"
+                    f"<span class='phrase'>{esc(ph)}</span> — <span class='definition-en'>{esc(en)}</span>"
+                    f"<div class='definition-ch'>{esc(ch)}</div>"
                     "</li>"
                 )
             phrase_block.append("</ul></div>")
@@ -440,89 +740,65 @@ def build_html_from_word_info(word_info: Dict[str, Any]) -> Dict[str, str]:
         if def_lines:
             definition_parts.append("<div>" + "\n".join(def_lines) + "</div>")
 
-    # 处理例句
-    for s in word_info.get("sentences", []):
-        sentence_text = s.get("notes").strip()
-        if not sentence_text:
-            continue
-        
-        # 1. 'Examples' 字段: 目标词加粗
-        escaped_sentence = html.escape(sentence_text)
-        highlighted = escaped_sentence
-        target_word = s.get("text") or word_to_highlight # 用于加粗的目标词
-        if target_word:
-            try:
-                pattern = re.compile(r'\b' + re.escape(html.escape(target_word.strip())) + r'\b', re.IGNORECASE)
-
-                highlighted = pattern.sub(lambda m: f"<strong>{m.group(0)}</strong>", escaped_sentence)
-            except re.error:
-                pass # 忽略正则错误
-        escaped_target = html.escape(target_word.strip())
-        if " " in target_word:
-            # 多词短语，不加 \b
-            pattern_for_blanking = re.compile(re.escape(escaped_target), re.IGNORECASE)
-        else:
-            # 单词，加边界防止误匹配
-            pattern_for_blanking = re.compile(r'\b' + re.escape(escaped_target) + r'\b', re.IGNORECASE)
-        # pattern_for_blanking = re.compile(r'\b' + re.escape(target_word) + r'\b', re.IGNORECASE)
-        # 2. 'Blanked_Examples' 字段: 所有单词字母替换为下划线
-        blanked_sentence = pattern_for_blanking.sub(replace_alnum_with_underscores, sentence_text)
-        escaped_blanked = html.escape(blanked_sentence)
-
-        # 来源信息
-        book = s.get("bookName") or ""
-        chapter = s.get("chapter") or ""
-        meta = f" — 《{html.escape(book)}》: {html.escape(chapter)}" if book else ""
-
-        examples_parts.append(f"<div class='example'><div class='example-text'>{highlighted}</div><div class='example-meta'>{meta}</div></div>")
-        blanked_examples_parts.append(f"<div class='example'><div class='example-text'>{escaped_blanked}</div><div class='example-meta'>{meta}</div></div>")
+    # 处理例句：逐句渲染成 (加粗块, 挖空块)，由 str.join 在 C 层拼接
+    meta_cache: Dict[Tuple[str, str], str] = {}
+    rendered = [
+        _render_sentence(s, word_to_highlight, meta_cache)
+        for s in word_info.get("sentences", [])
+    ]
 
     return {
         "POS_Definitions": "\n".join(pos_html_parts),
         "Pronunciation": "\n".join(pronunciation_parts),
         "Definition": "\n".join(definition_parts),
-        "Examples": "\n".join(examples_parts),
-        "Blanked_Examples": "\n".join(blanked_examples_parts)
+        "Examples": "\n".join(block for block, _ in rendered if block),
+        "Blanked_Examples": "\n".join(blanked for _, blanked in rendered if blanked)
     }
 
+# 模型结构常量：与 MODEL_CSS 一样放模块级，create_anki_model 每次调用
+# 不再重建这些字符串/字典字面量
+_MODEL_FIELDS = ["Word", "Pronunciation", "Definition", "POS_Definitions", "Examples", "Blanked_Examples", "Tags"]
+
+_CARD_TEMPLATES = [
+    {
+        "Name": "Basic",
+        "Front": "{{Word}}<hr>{{#Examples}}{{Examples}}{{/Examples}}",
+        "Back": """
+            {{FrontSide}}
+            <hr>
+            <div class='word-header'>{{Word}}</div>
+            <div class='definition-block'>{{Definition}}</div>
+            <div class='pos-block'>{{Pronunciation}}</div>
+            <div style='margin-top:20px;'><b>Examples:</b>{{Examples}}</div>
+        """
+    },
+    {
+        "Name": "Type",
+        "Front": "{{Definition}}<div style='margin-top:20px;'>{{Blanked_Examples}}</div>{{type:Word}}",
+        "Back": """
+            <div class='word-header'>{{Word}}</div>
+            <hr>
+            <div class='definition-block'>{{Definition}}</div>
+            <div class='pos-block'>{{Pronunciation}}</div>
+            <div style='margin-top:20px;'><b>Examples:</b>{{Examples}}</div>
+        """
+    }
+]
+
+
 def create_anki_model(model_name: str):
     """Create the Anki note type used by this script."""
-    fields = ["Word", "Pronunciation", "Definition", "POS_Definitions", "Examples", "Blanked_Examples", "Tags"]
-
-    card_templates = [
-        {
-            "Name": "Basic",
-            "Front": "{{Word}}<hr>{{#Examples}}{{Examples}}{{/Examples}}",
-            "Back": """
-                {{FrontSide}}
-                <hr>
-                <div class='word-header'>{{Word}}</div>
-                <div class='definition-block'>{{Definition}}</div>
-                <div class='pos-block'>{{Pronunciation}}</div>
-                <div style='margin-top:20px;'><b>Examples:</b>{{Examples}}</div>
-            """
-        },
-        {
-            "Name": "Type",
-            "Front": "{{Definition}}<div style='margin-top:20px;'>{{Blanked_Examples}}</div>{{type:Word}}",
-            "Back": """
-                <div class='word-header'>{{Word}}</div>
-                <hr>
-                <div class='definition-block'>{{Definition}}</div>
-                <div class='pos-block'>{{Pronunciation}}</div>
-                <div style='margin-top:20px;'><b>Examples:</b>{{Examples}}</div>
-            """
-        }
-    ]
-
-    print(f"正在创建模型: {model_name} ...")
+    _log(f"正在创建模型: {model_name} ...")
     invoke(
         "createModel",
         modelName=model_name,
-        inOrderFields=fields,
+        inOrderFields=_MODEL_FIELDS,
         css=MODEL_CSS,
-        cardTemplates=card_templates
+        cardTemplates=_CARD_TEMPLATES
     )
+    # 模型列表变了，丢弃缓存
+    global _model_names_cache
+    _model_names_cache = None
     update_model_css(model_name)
 
 
@@ -537,13 +813,21 @@ def update_model_css(model_name: str) -> None:
 
 def ensure_model_and_deck(deck_name: str, model_name: str):
     """确保牌组和模型存在，不存在则创建"""
-    invoke("createDeck", deck=deck_name)
-    model_names = invoke("modelNames").get("result", [])
+    global _model_names_cache
+    # createDeck 和 modelNames 合并为一次 multi 往返
+    results = invoke_multi([
+        _multi_action("createDeck", deck=deck_name),
+        _multi_action("modelNames"),
+    ])
+    names_res = results[1] if len(results) > 1 else None
+    model_names = (names_res.get("result") if isinstance(names_res, dict) else names_res) or []
+    # 顺手填充 modelNames 缓存，后续 get_model_names 不再发请求
+    _model_names_cache = (time.time(), model_names)
     if model_name not in model_names:
         create_anki_model(model_name)
-        print(f"模型 {model_name} 创建请求已发送。")
+        _log(f"模型 {model_name} 创建请求已发送。")
     else:
-        print(f"模型 {model_name} 已存在。")
+        _log(f"模型 {model_name} 已存在。")
 
 def add_word_to_anki(deck_name: str, word_info: Dict[str, Any]):
     """将一个单词作为新笔记添加到 Anki"""
@@ -582,38 +866,119 @@ def add_word_to_anki(deck_name: str, word_info: Dict[str, Any]):
     # print(f"正在添加笔记: '{word}'...")
     res = invoke("addNote", note=note)
     if res and not res.get("error") and res.get("result"):
-        print(f"  [成功] 笔记 '{word_prototype}' 添加成功, Note ID: {res.get('result')}")
+        _log(f"  [成功] 笔记 '{word_prototype}' 添加成功, Note ID: {res.get('result')}")
     else:
         print(f"  [失败] 添加笔记 '{word_prototype}' 失败。可能是笔记重复或发生其他错误。")
 
 
+def add_words_bulk(deck_name: str, word_infos: List[Dict[str, Any]], max_workers: int = 8):
+    """
+    线程池并发批量添加笔记：每个单词的耗时主要在等 AnkiConnect 和
+    音频下载的 socket I/O，GIL 在此期间释放，并发能把 N 次串行
+    往返压缩进一个时间窗。Session 连接池已按并发量配置。
+    """
+    if not word_infos:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda wi: add_word_to_anki(deck_name, wi), word_infos))
+
+
 def update_anki_full(deck_name: str, word_info: str):
     word = word_info.get("partOfSpeech")[0].get("wordPrototype", "")
     # 步骤 2: 查找笔记
     query = f'deck:"{deck_name}" "Word:{word}"'
     note_ids = invoke("findNotes", query=query).get("result", [])
     if not note_ids:
-        print(f"在牌组 '{deck_name}' 中未找到单词 '{word}' 的笔记。\n 开始加入笔记")
+        _log(f"在牌组 '{deck_name}' 中未找到单词 '{word}' 的笔记。\n 开始加入笔记")
         add_word_to_anki(deck_name, word_info)
         return
 
     # 步骤 3: 生成新内容
     generated_fields = build_html_from_word_info(word_info)
 
-    # 步骤 4: 获取笔记详情并更新
-    info_res = invoke("notesInfo", notes=note_ids).get("result", [])
-    example_sentence_html = info_res.get("result")[0].get("fields").get("Examples").get("value") or ""
-    example_blanked_sentence_html = info_res.get("result")[0].get("fields").get("Blanked_Examples").get("value")
+    # 步骤 4: 获取笔记详情，两个字段合并成一次 updateNoteFields 请求
+    info_res = invoke("notesInfo", notes=note_ids).get("result") or []
+    if not info_res:
+        print(f"无法获取笔记 {note_ids} 的详情，跳过更新。")
+        return
+    fields = info_res[0].get("fields") or {}
+    example_sentence_html = (fields.get("Examples") or {}).get("value") or ""
+    example_blanked_sentence_html = (fields.get("Blanked_Examples") or {}).get("value") or ""
     new_sentence_html = example_sentence_html + generated_fields.get("Examples","")
     new_blanked_sentence_html = example_blanked_sentence_html + generated_fields.get("Blanked_Examples","")
 
-    upd0 = invoke("updateNoteFields", note={"id": note_ids, "fields": {"Examples": new_sentence_html}})
-    upd1 = invoke("updateNoteFields", note={"id": note_ids, "fields": {"Blanked_Examples": new_blanked_sentence_html}})
-    print(upd0, upd1)
+    upd = invoke("updateNoteFields", note={
+        "id": info_res[0].get("noteId"),
+        "fields": {"Examples": new_sentence_html, "Blanked_Examples": new_blanked_sentence_html},
+    })
+    _log(upd)
 
     return
 
 
+def find_existing_notes(deck_name: str, words: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    用一条 OR 查询一次性找出 N 个单词在牌组中已有的笔记，
+    返回 {word(casefold): notesInfo 条目}；同一单词多条笔记时取第一条。
+    相比逐词 findNotes，把 N 个子请求压成一条查询。
+    """
+    words = [w for w in words if w]
+    if not words:
+        return {}
+    query = f'deck:"{deck_name}" (' + ' OR '.join(f'"Word:{w}"' for w in words) + ')'
+    note_ids = invoke("findNotes", query=query).get("result") or []
+    if not note_ids:
+        return {}
+    notes = invoke("notesInfo", notes=note_ids).get("result") or []
+    by_word: Dict[str, Dict[str, Any]] = {}
+    for note in notes:
+        value = (((note or {}).get("fields") or {}).get("Word") or {}).get("value") or ""
+        key = value.strip().casefold()
+        if key and key not in by_word:
+            by_word[key] = note
+    return by_word
+
+
+def update_anki_full_batch(deck_name: str, word_infos: List[Dict[str, Any]]):
+    """
+    批量版 update_anki_full：一条 OR 查询 + 一次 notesInfo 拿到全部既有笔记，
+    再把所有 updateNoteFields 合并成一次 multi（共 3 次 HTTP 往返）。
+    新单词仍逐个走 add_word_to_anki（音频下载占大头，批量收益有限）。
+    """
+    if not word_infos:
+        return
+
+    words = [
+        ((wi.get("partOfSpeech") or [{}])[0].get("wordPrototype") or wi.get("word") or "").strip()
+        for wi in word_infos
+    ]
+    existing_by_word = find_existing_notes(deck_name, words)
+
+    update_actions: List[Dict[str, Any]] = []
+    for wi, word in zip(word_infos, words):
+        note = existing_by_word.get(word.casefold())
+        if note is None:
+            _log(f"在牌组 '{deck_name}' 中未找到单词 '{word}' 的笔记。\n 开始加入笔记")
+            add_word_to_anki(deck_name, wi)
+            continue
+        fields = note.get("fields") or {}
+        generated_fields = build_html_from_word_info(wi)
+        new_examples = (
+            ((fields.get("Examples") or {}).get("value") or "")
+            + generated_fields.get("Examples", "")
+        )
+        new_blanked = (
+            ((fields.get("Blanked_Examples") or {}).get("value") or "")
+            + generated_fields.get("Blanked_Examples", "")
+        )
+        update_actions.append(_multi_action(
+            "updateNoteFields",
+            note={"id": note.get("noteId"),
+                  "fields": {"Examples": new_examples, "Blanked_Examples": new_blanked}},
+        ))
+    invoke_multi(update_actions)
+
+
 # ----------------- 主流程示例 -----------------
 if __name__ == "__main__":
     DECK = "test" # 定义你的目标牌组
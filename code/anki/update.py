@@ -4,13 +4,14 @@
 """
 from __future__ import annotations
 
-import base64
+import binascii
 import hashlib
 import importlib.util
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
 
@@ -26,16 +27,14 @@ sys.modules["anki_module"] = anki
 spec.loader.exec_module(anki)
 
 
-def chunked(iterable: Iterable[int], size: int) -> Iterable[List[int]]:
-    """把可迭代对象按固定大小分块。"""
-    block: List[int] = []
-    for item in iterable:
-        block.append(item)
-        if len(block) >= size:
-            yield block
-            block = []
-    if block:
-        yield block
+# 音频下载共用一个 Session：几百个小文件逐个新建 TCP+TLS 连接的开销
+# 比下载本身还贵，keep-alive 连接池把握手摊薄到每主机一次
+_AUDIO_SESSION = requests.Session()
+for _prefix in ("http://", "https://"):
+    _AUDIO_SESSION.mount(_prefix, requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# 下载是纯网络等待，线程在 socket 阻塞时释放 GIL，16 路并发足够打满带宽
+_AUDIO_WORKERS = 16
 
 
 def update_notes_audio(
@@ -58,6 +57,7 @@ def update_notes_audio(
         print(f"[音频] 无法获取牌组 '{deck_name}' 的笔记详情。")
         return
 
+    update_actions: List[Dict[str, Any]] = []
     for note in notes_details:
         fields_data = note.get("fields") or {}
         word_value = (fields_data.get("Word") or {}).get("value", "").strip()
@@ -85,9 +85,14 @@ def update_notes_audio(
         if not fields_to_update:
             continue
 
-        anki.invoke("updateNoteFields", note={"id": note.get("noteId"), "fields": fields_to_update})
+        update_actions.append(anki._multi_action(
+            "updateNoteFields", note={"id": note.get("noteId"), "fields": fields_to_update}
+        ))
         print(f"[音频] '{word_value}' 已补充音频。")
 
+    # 所有字段更新合并为一次 multi 往返
+    anki.invoke_multi(update_actions)
+
 
 US_AUDIO_ROW_PATTERN = re.compile(
     r'(<div[^>]*class=["\']audio-row["\'][^>]*>.*?US:.*?src=["\']([^"\']+)["\'].*?</div>)',
@@ -100,28 +105,29 @@ def _store_audio_from_url(word_value: str, audio_url: str, suffix: str = "-us")
     if not audio_url:
         return None
 
+    # 同一 URL 之前已经入库的话直接复用（增量重跑时几乎全部命中）
+    cached = anki.lookup_cached_audio(audio_url)
+    if cached:
+        return f"[sound:{cached}]"
+
     try:
-        resp = requests.get(
-            audio_url,
-            timeout=max(getattr(anki, "REQUEST_TIMEOUT", 2.0), 5),
-            headers=getattr(anki, "AUDIO_HTTP_HEADERS", {}),
-        )
-        resp.raise_for_status()
+        audio_bytes, content_type = anki.download_audio_bytes(audio_url, session=_AUDIO_SESSION)
     except requests.RequestException as exc:
         print(f"[音频] 下载失败: {audio_url} ({exc})")
         return None
 
-    extension = anki.infer_audio_extension(audio_url, resp.headers.get("Content-Type", ""))
+    extension = anki.infer_audio_extension(audio_url, content_type)
     base_word = word_value or "audio"
-    hash_tail = hashlib.md5(audio_url.encode("utf-8")).hexdigest()[:8]
+    hash_tail = hashlib.blake2b(audio_url.encode("utf-8"), digest_size=4).hexdigest()
     filename = f"{anki.sanitize_media_filename(base_word)}{suffix}-{hash_tail}{extension}"
 
-    encoded = base64.b64encode(resp.content).decode("utf-8")
+    encoded = binascii.b2a_base64(memoryview(audio_bytes), newline=False).decode("ascii")
     store_res = anki.invoke("storeMediaFile", filename=filename, data=encoded)
     if store_res.get("error"):
         print(f"[音频] 存储失败: {store_res['error']} ({audio_url})")
         return None
 
+    anki.remember_cached_audio(audio_url, filename)
     return f"[sound:{filename}]"
 
 
@@ -138,31 +144,52 @@ def backfill_sound_from_pos_definitions(deck_name: Optional[str] = None) -> None
         return
 
     processed = 0
-    for batch in chunked(note_ids, 50):
-        notes_info = anki.invoke("notesInfo", notes=batch).get("result") or []
-        for note in notes_info:
-            processed += 1
-            fields_data = note.get("fields") or {}
-            word_value = (fields_data.get("Word") or {}).get("value", "").strip()
-            pos_field = (fields_data.get("POS_Definitions") or {}).get("value", "")
-            if not pos_field:
-                continue
-
-            match = US_AUDIO_ROW_PATTERN.search(pos_field)
-            if not match:
-                continue
-
-            audio_row_html, audio_url = match.groups()
-            sound_markup = _store_audio_from_url(word_value, audio_url)
-            if not sound_markup or sound_markup in pos_field:
+    with ThreadPoolExecutor(max_workers=_AUDIO_WORKERS) as executor:
+        # note_ids 本来就是完整列表，直接按步长切片分批
+        for i in range(0, len(note_ids), 50):
+            batch = note_ids[i:i + 50]
+            notes_info = anki.invoke("notesInfo", notes=batch).get("result") or []
+
+            # 先串行筛出本批需要下载的候选……
+            candidates: List[Tuple[int, str, str, int, str]] = []
+            for note in notes_info:
+                processed += 1
+                fields_data = note.get("fields") or {}
+                word_value = (fields_data.get("Word") or {}).get("value", "").strip()
+                pos_field = (fields_data.get("POS_Definitions") or {}).get("value", "")
+                # 增量跑时绝大多数笔记要么没有 US 音频行、要么早已补过
+                # [sound:]；先用廉价的子串探测挡掉，再上 DOTALL 正则
+                if not pos_field or "US:" not in pos_field or "[sound:" in pos_field:
+                    continue
+
+                match = US_AUDIO_ROW_PATTERN.search(pos_field)
+                if not match:
+                    continue
+
+                # 记下音频行的结束偏移，插入时直接切片拼接，
+                # 不再用 str.replace 把整个字段重扫一遍
+                candidates.append((note.get("noteId"), word_value, pos_field, match.end(1), match.group(2)))
+
+            if not candidates:
                 continue
 
-            updated_html = pos_field.replace(audio_row_html, f"{audio_row_html}{sound_markup}", 1)
-            anki.invoke(
-                "updateNoteFields",
-                note={"id": note.get("noteId"), "fields": {"POS_Definitions": updated_html}},
-            )
-            print(f"[音频] '{word_value}' 已补充 US 发音。")
+            # ……再并发下载音频；updateNoteFields 回到主线程串行发，
+            # 避免并发写 AnkiConnect
+            markups = list(executor.map(
+                lambda c: _store_audio_from_url(c[1], c[4]), candidates
+            ))
+            # 本批的所有字段更新合并成一次 multi 往返
+            update_actions: List[Dict[str, Any]] = []
+            for (note_id, word_value, pos_field, row_end, _url), sound_markup in zip(candidates, markups):
+                if not sound_markup or sound_markup in pos_field:
+                    continue
+                updated_html = pos_field[:row_end] + sound_markup + pos_field[row_end:]
+                update_actions.append(anki._multi_action(
+                    "updateNoteFields",
+                    note={"id": note_id, "fields": {"POS_Definitions": updated_html}},
+                ))
+                print(f"[音频] '{word_value}' 已补充 US 发音。")
+            anki.invoke_multi(update_actions)
 
     print(f"[音频] 处理完成，共检查 {processed} 条笔记。")
 
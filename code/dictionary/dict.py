@@ -4,16 +4,47 @@
 # %%
 import requests
 from bs4 import BeautifulSoup
+import soupsieve as sv
 from typing import List, Dict, Optional, Set, Tuple
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import functools
+import os
+import sqlite3
+import threading
 import time
 import re
+import zlib
 
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                   "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/100.0.4896.127 Safari/537.36"
+                  "Chrome/100.0.4896.127 Safari/537.36",
+    # 明确声明接受压缩，词典页 HTML 压缩后体积约为原来的 1/5
+    "Accept-Encoding": "gzip, deflate",
 }
 
+try:
+    # requests 只有装了 brotli 才能解 br，按实际可用性声明
+    import brotli  # noqa: F401
+    DEFAULT_HEADERS["Accept-Encoding"] = "gzip, deflate, br"
+except ImportError:
+    pass
+
+# 共用 Session：对同一域名的请求复用 keep-alive 连接，省掉每个单词
+# 一次 TLS 握手；顺带在传输层做好限流/瞬时故障的退避重试
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# 每个单词有两个候选 URL（中英双解/纯英文），并发抓取两个页面，
+# 谁先要用谁；2 个线程刚好覆盖一次查询
+_LOOKUP_POOL = ThreadPoolExecutor(max_workers=2)
+
 default_part_of_speech = {
     "type": "",
     "wordPrototype": "",
@@ -30,17 +61,97 @@ SPELLING_OF_PATTERN = re.compile(
 )
 
 
+# 页面缓存：词典页内容基本不变，落盘后重跑词表时直接命中本地，
+# 不再重复抓同一个页面；HTML 压缩后存，几千个词也就几十 MB
+_HTML_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_cache.sqlite3")
+_HTML_CACHE_TTL = 30 * 24 * 3600  # 30 天后过期重抓
+_html_cache_lock = threading.Lock()
+_html_cache_conn: Optional[sqlite3.Connection] = None
+
+
+class _TokenBucket:
+    """
+    简单令牌桶：限制真正出网的请求频率。
+    与固定 sleep 不同，只有实际发请求才消耗令牌，缓存命中零等待；
+    短暂的突发可以用攒下的令牌立即放行。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> None:
+        """阻塞直到拿到一个令牌。"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# 平均每秒最多 2 个出网请求，对词典站点足够克制
+_RATE_LIMITER = _TokenBucket(rate=2.0)
+
+
+def _html_cache() -> sqlite3.Connection:
+    """懒加载页面缓存连接（WAL 模式，允许跨线程使用，外部用锁保护）。"""
+    global _html_cache_conn
+    if _html_cache_conn is None:
+        conn = sqlite3.connect(_HTML_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS html_cache ("
+            "url TEXT PRIMARY KEY, fetched_at INTEGER, html BLOB)"
+        )
+        conn.commit()
+        _html_cache_conn = conn
+    return _html_cache_conn
+
+
 def fetch_html(url: str, headers: Optional[Dict] = None, timeout: int = 10) -> Optional[str]:
     headers = headers or DEFAULT_HEADERS
+
+    # 先查本地缓存，命中且未过期就完全不走网络
+    try:
+        with _html_cache_lock:
+            row = _html_cache().execute(
+                "SELECT fetched_at, html FROM html_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row and time.time() - row[0] < _HTML_CACHE_TTL:
+            return zlib.decompress(row[1]).decode("utf-8")
+    except Exception:
+        pass  # 缓存损坏/不可用时退回直接抓取
+
+    # 只有真正出网时才限速，缓存命中不排队
+    _RATE_LIMITER.take()
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _SESSION.get(url, headers=headers, timeout=timeout)
         resp.raise_for_status()
-        return resp.text
+        html = resp.text
     except Exception as e:
         # 可以根据需要打印或记录日志
         # print(f"fetch_html error for {url}: {e}")
         return None
 
+    try:
+        with _html_cache_lock:
+            _html_cache().execute(
+                "INSERT OR REPLACE INTO html_cache (url, fetched_at, html) VALUES (?, ?, ?)",
+                (url, int(time.time()), zlib.compress(html.encode("utf-8")))
+            )
+            _html_cache().commit()
+    except Exception:
+        pass  # 写缓存失败不影响本次结果
+    return html
+
 
 def _abs_audio_url(src: Optional[str]) -> str:
     if not src:
@@ -51,6 +162,43 @@ def _abs_audio_url(src: Optional[str]) -> str:
     return "https://dictionary.cambridge.org" + src
 
 
+# 折叠连续空白用的正则：_text_or_empty 每解析一个词要跑上百次，
+# 预编译后比 split+join 少一轮中间 list 分配
+_WS_RE = re.compile(r"\s+")
+
+# CSS 选择器预编译：bs4 的 select/select_one 每次都会把选择器字符串
+# 交给 soupsieve 重新解析，热路径上同一批选择器每页要解析几十次；
+# 编译成模块级常量后只解析一次
+_SEL_HEADWORD = sv.compile(".headword.dhw, .headword")
+_SEL_POS = sv.compile(".pos.dpos, .pos")
+_SEL_POSGRAM = sv.compile(".posgram.dpos-g.hdib.lmr-5, .posgram.dpos-g, .posgram")
+_SEL_UK_PRON = sv.compile(".uk.dpron-i")
+_SEL_US_PRON = sv.compile(".us.dpron-i")
+_SEL_PHONETIC = sv.compile(".pron.dpron")
+_SEL_AUDIO_SRC = sv.compile('audio source[type="audio/mpeg"]')
+_SEL_DEF_BLOCK = sv.compile("div.def-block.ddef_block")
+_SEL_EN_DEF = sv.compile(".def.ddef_d.db, .def.ddef_d")
+_SEL_EN_DEF_DB = sv.compile(".def.ddef_d.db")
+_SEL_CH_TRANS = sv.compile(".trans.dtrans.dtrans-se, .trans.dtrans")
+_SEL_CH_TRANS_SE = sv.compile(".trans.dtrans.dtrans-se")
+_SEL_CH_TRANS_ANY = sv.compile(".trans.dtrans")
+_SEL_PHRASE_BLOCK = sv.compile(".phrase-block.dphrase-block, .phrase-block")
+_SEL_PHRASE_TITLE = sv.compile(".phrase-head.dphrase_h .phrase-title")
+_SEL_PHRASE_DEF_BLOCK = sv.compile(".def-block.ddef_block")
+_SEL_POS_BODY = sv.compile(".pos-body")
+_SEL_ENTRY_BODY = sv.compile(".entry-body__el")
+_SEL_IDIOM_BLOCK = sv.compile(".idiom-block.didiom-block, .didiom-block, .idiom-block")
+
+
+def _sel_one(compiled, scope):
+    """用预编译选择器取第一个匹配，等价于 select_one。"""
+    if scope is None:
+        return None
+    for el in compiled.iselect(scope):
+        return el
+    return None
+
+
 def _text_or_empty(elem) -> str:
     """
     从 bs4 元素安全提取文本：
@@ -62,8 +210,7 @@ def _text_or_empty(elem) -> str:
     # 在子节点之间插入空格，strip=True 去除首尾空白
     text = elem.get_text(separator=' ', strip=True)
     # 折叠任意连续空白（空格、制表、换行、\xa0等）为单个普通空格
-    text = ' '.join(text.split())
-    return text
+    return _WS_RE.sub(' ', text)
 
 def parse_idiom_block(entry) -> Dict:
     """
@@ -82,7 +229,7 @@ def parse_idiom_block(entry) -> Dict:
     }
 
     # 词头（原型）—— snippet 中 headword 在 h2.headword ... <b>on track</b>
-    headword = entry.select_one(".headword.dhw, .headword")
+    headword = _sel_one(_SEL_HEADWORD, entry)
     # 有时词头被包在 <b> 内
     if headword:
         b = headword.select_one("b")
@@ -91,21 +238,23 @@ def parse_idiom_block(entry) -> Dict:
         pos["wordPrototype"] = ""
 
     # 词性（type），在 snippet 中是 <span class="pos dpos">
-    pos_tag = entry.select_one(".pos.dpos, .pos")
+    pos_tag = _sel_one(_SEL_POS, entry)
     pos["type"] = _text_or_empty(pos_tag)
 
     # 解析 definitions（排除短语块中的定义）
-    for ddef in entry.select("div.def-block.ddef_block, div.def-block.ddef_block "):
+    # 原选择器把同一个 selector 写了两遍（仅差一个尾随空格），
+    # 每个 def-block 都会被匹配两次再去重，白跑一倍的匹配
+    for ddef in _SEL_DEF_BLOCK.select(entry):
         # 如果这个 ddef 在 phrase-block 内则跳过
         if ddef.find_parent(class_="phrase-block"):
             continue
 
-        en_def_el = ddef.select_one(".def.ddef_d.db, .def.ddef_d")
+        en_def_el = _sel_one(_SEL_EN_DEF, ddef)
         en_def = _text_or_empty(en_def_el)
 
         # 找中文释义，优先选 .trans.dtrans.dtrans-se 且不属于 .hdb
         ch_text = ""
-        ch_candidates = ddef.select(".trans.dtrans.dtrans-se, .trans.dtrans")
+        ch_candidates = _SEL_CH_TRANS.select(ddef)
         if ch_candidates:
             for ch in ch_candidates:
                 # 跳过属于 .hdb 的（通常是隐藏类或次要翻译）
@@ -255,43 +404,43 @@ def _parse_pos_block(meta_scope, content_scope, fallback_headword: str = "") ->
     meta_scope = meta_scope or content_scope
 
     # word prototype & type
-    headword = meta_scope.select_one(".headword.dhw, .headword") if meta_scope else None
+    headword = _sel_one(_SEL_HEADWORD, meta_scope)
     if not headword and content_scope is not meta_scope:
-        headword = content_scope.select_one(".headword.dhw, .headword")
+        headword = _sel_one(_SEL_HEADWORD, content_scope)
     pos["wordPrototype"] = _text_or_empty(headword) or fallback_headword
-    posgram = meta_scope.select_one(".posgram.dpos-g.hdib.lmr-5, .posgram.dpos-g, .posgram") if meta_scope else None
+    posgram = _sel_one(_SEL_POSGRAM, meta_scope)
     if not posgram and content_scope is not meta_scope:
-        posgram = content_scope.select_one(".posgram.dpos-g.hdib.lmr-5, .posgram.dpos-g, .posgram")
+        posgram = _sel_one(_SEL_POSGRAM, content_scope)
     pos["type"] = _text_or_empty(posgram)
 
     # UK pronunciation
-    uk = meta_scope.select_one(".uk.dpron-i") if meta_scope else None
+    uk = _sel_one(_SEL_UK_PRON, meta_scope)
     if not uk and content_scope is not meta_scope:
-        uk = content_scope.select_one(".uk.dpron-i")
+        uk = _sel_one(_SEL_UK_PRON, content_scope)
     if uk:
-        phon = uk.select_one(".pron.dpron")
+        phon = _sel_one(_SEL_PHONETIC, uk)
         pos["pronunciationUK"]["phonetic"] = _text_or_empty(phon)
         src = None
-        src_tag = uk.select_one('audio source[type="audio/mpeg"]')
+        src_tag = _sel_one(_SEL_AUDIO_SRC, uk)
         if src_tag:
             src = src_tag.get("src")
         pos["pronunciationUK"]["pronUrl"] = _abs_audio_url(src)
 
     # US pronunciation
-    us = meta_scope.select_one(".us.dpron-i") if meta_scope else None
+    us = _sel_one(_SEL_US_PRON, meta_scope)
     if not us and content_scope is not meta_scope:
-        us = content_scope.select_one(".us.dpron-i")
+        us = _sel_one(_SEL_US_PRON, content_scope)
     if us:
-        phon = us.select_one(".pron.dpron")
+        phon = _sel_one(_SEL_PHONETIC, us)
         pos["pronunciationUS"]["phonetic"] = _text_or_empty(phon)
         src = None
-        src_tag = us.select_one('audio source[type="audio/mpeg"]')
+        src_tag = _sel_one(_SEL_AUDIO_SRC, us)
         if src_tag:
             src = src_tag.get("src")
         pos["pronunciationUS"]["pronUrl"] = _abs_audio_url(src)
 
     # definitions (exclude those inside phrase-block)
-    for ddef in content_scope.select("div.def-block.ddef_block"):
+    for ddef in _SEL_DEF_BLOCK.select(content_scope):
         # 仅处理“最近 pos-body 就是当前 content_scope”的 definition，
         # 避免把嵌套词性块（如 Verb）混进当前词性（如 Noun）。
         if _nearest_pos_body(ddef) is not content_scope:
@@ -299,9 +448,9 @@ def _parse_pos_block(meta_scope, content_scope, fallback_headword: str = "") ->
         # 判断是否在短语块中
         if ddef.find_parent(class_="phrase-block"):
             continue
-        en_def = _text_or_empty(ddef.select_one(".def.ddef_d.db"))
+        en_def = _text_or_empty(_sel_one(_SEL_EN_DEF_DB, ddef))
         # 中文释义选择器尽量模仿原选择器： .trans.dtrans.dtrans-se 且不属于 .hdb
-        ch_candidates = ddef.select(".trans.dtrans.dtrans-se")
+        ch_candidates = _SEL_CH_TRANS_SE.select(ddef)
         ch_text = ""
         if ch_candidates:
             # 取第一个不在 .hdb 中的
@@ -313,25 +462,25 @@ def _parse_pos_block(meta_scope, content_scope, fallback_headword: str = "") ->
                     break
         else:
             # 退而求其次：找任意 .trans.dtrans
-            ch = ddef.select_one(".trans.dtrans")
+            ch = _sel_one(_SEL_CH_TRANS_ANY, ddef)
             ch_text = _text_or_empty(ch) if ch else ""
         pos["definitions"].append({"enMeaning": en_def, "chMeaning": ch_text})
 
     # phrases and phrase definitions
-    for phrase_block in content_scope.select(".phrase-block.dphrase-block, .phrase-block"):
+    for phrase_block in _SEL_PHRASE_BLOCK.select(content_scope):
         # 同样限制在当前 pos-body 归属范围内，避免跨词性污染。
         if _nearest_pos_body(phrase_block) is not content_scope:
             continue
         # phrase title
-        phrase_title = _text_or_empty(phrase_block.select_one(".phrase-head.dphrase_h .phrase-title"))
+        phrase_title = _text_or_empty(_sel_one(_SEL_PHRASE_TITLE, phrase_block))
         if phrase_title:
             pos["phrases"].append(phrase_title)
 
         # phrase defs
-        for phrase_def_block in phrase_block.select(".def-block.ddef_block"):
-            en_phrase_def = _text_or_empty(phrase_def_block.select_one(".def.ddef_d.db"))
+        for phrase_def_block in _SEL_PHRASE_DEF_BLOCK.select(phrase_block):
+            en_phrase_def = _text_or_empty(_sel_one(_SEL_EN_DEF_DB, phrase_def_block))
             # 中文释义：排除包含 example 的部分（原 JS .not('.examp')）
-            ch_candidates = phrase_def_block.select(".trans.dtrans")
+            ch_candidates = _SEL_CH_TRANS_ANY.select(phrase_def_block)
             ch_text = ""
             if ch_candidates:
                 for ch in ch_candidates:
@@ -352,10 +501,10 @@ def parse_entry_body(entry) -> List[Dict]:
     重点：按每个 pos-body 分段，避免把不同词性的 definition 混在一起。
     """
     pos_list: List[Dict] = []
-    fallback_headword = _text_or_empty(entry.select_one(".headword.dhw, .headword"))
+    fallback_headword = _text_or_empty(_sel_one(_SEL_HEADWORD, entry))
 
     # Cambridge 的一个 entry 可能包含多个 pos-body（如同词包含 noun + verb）。
-    pos_bodies = entry.select(".pos-body")
+    pos_bodies = _SEL_POS_BODY.select(entry)
     if pos_bodies:
         for body in pos_bodies:
             header = body.find_previous_sibling(
@@ -387,23 +536,39 @@ def _merge_pronunciations_from_english(ch_res: Dict, en_res: Dict) -> Dict:
     if not ch_parts or not en_parts:
         return ch_res
 
-    # 建 index by wordPrototype for english parts
-    en_by_proto = {}
-    for idx, p in enumerate(en_parts):
-        proto = p.get("wordPrototype", "")
-        if proto:
-            # 若重复 proto 则保留第一个
-            if proto not in en_by_proto:
+    # 英文页整页都没有任何发音时，覆盖循环注定全程空转，直接返回
+    if not any(
+        (p.get("pronunciationUK") or {}).get("phonetic")
+        or (p.get("pronunciationUK") or {}).get("pronUrl")
+        or (p.get("pronunciationUS") or {}).get("phonetic")
+        or (p.get("pronunciationUS") or {}).get("pronUrl")
+        for p in en_parts
+    ):
+        return ch_res
+
+    # 按 wordPrototype 找英文词性：词性通常只有两三个，小列表线性扫
+    # 比先建 dict 索引更省；条目多时才值得建索引（重复 proto 保留第一个）
+    en_by_proto: Optional[Dict[str, Dict]] = None
+    if len(en_parts) > 4:
+        en_by_proto = {}
+        for p in en_parts:
+            proto = p.get("wordPrototype", "")
+            if proto and proto not in en_by_proto:
                 en_by_proto[proto] = p
 
+    def _en_part_by_proto(proto: str) -> Optional[Dict]:
+        if en_by_proto is not None:
+            return en_by_proto.get(proto)
+        for p in en_parts:
+            if p.get("wordPrototype", "") == proto:
+                return p
+        return None
+
     # 尝试按 prototype 覆盖
-    used_en_indices = set()
     for i, ch_p in enumerate(ch_parts):
         proto = ch_p.get("wordPrototype", "")
-        matched = None
-        if proto and proto in en_by_proto:
-            matched = en_by_proto[proto]
-        else:
+        matched = _en_part_by_proto(proto) if proto else None
+        if matched is None:
             # fallback: try to use same-index english part
             if i < len(en_parts):
                 matched = en_parts[i]
@@ -427,10 +592,10 @@ def _merge_pronunciations_from_english(ch_res: Dict, en_res: Dict) -> Dict:
 def get_word_info_from_url(url: str, sleep: float = 0.0) -> Dict:
     """
     解析指定 Cambridge Dictionary 页面（完整 URL），返回嵌套 dict 结构。
+    sleep 参数仅为兼容旧调用保留：限速已由 fetch_html 里的令牌桶接管，
+    缓存命中的页面不再被无谓地 sleep。
     """
     html = fetch_html(url)
-    if sleep:
-        time.sleep(sleep)
     if not html:
         return {"wordUrl": url, "partOfSpeech": [default_part_of_speech.copy()]}
 
@@ -438,26 +603,26 @@ def get_word_info_from_url(url: str, sleep: float = 0.0) -> Dict:
     result = {"wordUrl": url, "partOfSpeech": []}
 
     # 遍历每个 entry-body__el
-    entry_elems = soup.select(".entry-body__el")
+    entry_elems = _SEL_ENTRY_BODY.select(soup)
     if len(entry_elems):
         for entry_el in entry_elems:
             pos_list = parse_entry_body(entry_el)
             for pos_dict in pos_list:
                 if _is_non_empty_pos(pos_dict):
-                    # push a shallow copy to avoid引用
-                    result["partOfSpeech"].append(dict(pos_dict))
+                    # _parse_pos_block 每次都新建 dict，无共享引用，直接收编
+                    result["partOfSpeech"].append(pos_dict)
     # 仅解析真正的 idiom block，避免把整个 .di-body（二次包含所有词性）重复抓取。
-    idiom_elems = soup.select(".idiom-block.didiom-block, .didiom-block, .idiom-block")
+    idiom_elems = _SEL_IDIOM_BLOCK.select(soup)
     if len(idiom_elems):
         for entry_idiom in idiom_elems:
             pos_dict = parse_idiom_block(entry_idiom)
             if pos_dict.get("wordPrototype") or pos_dict.get("definitions") or pos_dict.get("phrases"):
-                # push a shallow copy to avoid引用
-                result["partOfSpeech"].append(dict(pos_dict))
+                # parse_idiom_block 同样返回独立的新 dict
+                result["partOfSpeech"].append(pos_dict)
     return result
 
 
-def get_word_info_by_word(
+def _get_word_info_by_word_uncached(
     word: str,
     sleep: float = 0.0,
     _visited: Optional[Set[str]] = None,
@@ -482,8 +647,11 @@ def get_word_info_by_word(
         f"https://dictionary.cambridge.org/dictionary/english-chinese-simplified/{query_word}",
         f"https://dictionary.cambridge.org/dictionary/english/{query_word}"
     ]
-    for url in url_list:
-        res = get_word_info_from_url(url, sleep=sleep)
+    # 两个候选 URL 并发抓取；仍按优先级顺序取结果，
+    # 中英双解页命中时直接返回，英文页的请求在后台跑完即被丢弃
+    futures = [_LOOKUP_POOL.submit(get_word_info_from_url, url, sleep) for url in url_list]
+    for future in futures:
+        res = future.result()
         # 判断是否抓取到有用内容：至少有一个非空的 partOfSpeech
         if res.get("partOfSpeech"):
             # 确认不是仅包含 default placeholder
@@ -513,6 +681,34 @@ def get_word_info_by_word(
     return {"wordUrl": "", "partOfSpeech": [default_part_of_speech.copy()]}
 
 
+@functools.lru_cache(maxsize=4096)
+def _cached_word_info(lower_word: str, sleep: float) -> Dict:
+    return _get_word_info_by_word_uncached(lower_word, sleep=sleep)
+
+
+def get_word_info_by_word(
+    word: str,
+    sleep: float = 0.0,
+    _visited: Optional[Set[str]] = None,
+    _depth: int = 0,
+    _max_spelling_expand_depth: int = 1
+) -> Dict:
+    """
+    get_word_info_by_word 的缓存入口：同一进程内重复查同一个词
+    （词表去重不彻底、多张卡引用同一个词时很常见）直接复用结果。
+    缓存值是可变的嵌套 dict，返回前深拷贝一份，调用方可随意修改。
+    """
+    if _visited is not None or _depth:
+        # 拼写扩展的递归调用携带遍历状态，不走缓存
+        return _get_word_info_by_word_uncached(
+            word, sleep, _visited, _depth, _max_spelling_expand_depth
+        )
+    query_word = (word or "").strip()
+    if not query_word:
+        return {"wordUrl": "", "partOfSpeech": [default_part_of_speech.copy()]}
+    return copy.deepcopy(_cached_word_info(query_word.lower(), sleep))
+
+
 def get_word_info(word_or_url: str, sleep: float = 1.0) -> Dict:
     """
     通用入口：如果输入包含 'http' 则按 URL 解析，否则按单词尝试多个 URL。
@@ -538,6 +734,20 @@ def get_word_info(word_or_url: str, sleep: float = 1.0) -> Dict:
         return get_word_info_by_word(word_or_url, sleep=sleep)
 
 
+def get_word_infos(words: List[str], max_workers: int = 8) -> Dict[str, Dict]:
+    """
+    批量查词：线程池并发抓取多个单词，返回 {word: word_info}。
+    查词耗时几乎全是网络等待，线程在 socket 阻塞时释放 GIL，
+    并发抓取即可把整批词表的总耗时压到最慢一次请求的量级。
+    """
+    words = [w for w in (words or []) if (w or "").strip()]
+    if not words:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        infos = list(executor.map(get_word_info_by_word, words))
+    return dict(zip(words, infos))
+
+
 # Example usage:
 if __name__ == "__main__":
     # 单词形式
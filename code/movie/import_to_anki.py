@@ -19,7 +19,7 @@ from typing import Dict, Any, List, Tuple, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from anki.anki import invoke, MODEL_NAME, MODEL_CSS, ensure_pronunciation_audio, build_html_from_word_info, ensure_model_and_deck
 from dictionary.dict import get_word_info_by_word
-from NLP.NLP import nlp
+from NLP.NLP import get_nlp
 
 # ==================== 配置项 ====================
 DECK_NAME = "Media"  # 牌组名称
@@ -318,17 +318,10 @@ def build_example_with_image(image_filename: str, audio_filename: str,
 
 def build_blanked_example(sentence: str, target_word: str, book_name: str = "Movie", timestamp: str = "") -> str:
     """构建Blanked_Examples字段"""
-    from anki.anki import replace_alnum_with_underscores
-    
-    escaped_sentence = html.escape(sentence)
-    escaped_target = html.escape(target_word.strip())
-    
-    if " " in target_word:
-        pattern = re.compile(re.escape(escaped_target), re.IGNORECASE)
-    else:
-        pattern = re.compile(r'\b' + re.escape(escaped_target) + r'\b', re.IGNORECASE)
-    
-    blanked_sentence = pattern.sub(replace_alnum_with_underscores, sentence)
+    from anki.anki import pattern_for_blanking, replace_alnum_with_underscores
+
+    # 挖空在未 escape 的原句上做，模式同样用原始目标词构造
+    blanked_sentence = pattern_for_blanking(target_word.strip()).sub(replace_alnum_with_underscores, sentence)
     escaped_blanked = html.escape(blanked_sentence)
     
     # 格式化时间戳
@@ -421,7 +414,7 @@ def lemmatize_with_nltk_spacy(sentence: str, target_word: str) -> Optional[Tuple
             return mapping.get(spacy_pos, wordnet.NOUN)
         
         # 使用 spaCy 获取词性
-        doc = nlp(sentence)
+        doc = get_nlp()(sentence)
         for token in doc:
             if token.text.lower() == target_word.lower():
                 pos = token.pos_
@@ -453,7 +446,7 @@ def lemmatize_with_spacy(sentence: str, target_word: str) -> Optional[Tuple[str,
     返回: (prototype, pos) 或 None
     """
     try:
-        doc = nlp(sentence)
+        doc = get_nlp()(sentence)
         for token in doc:
             if token.text.lower() == target_word.lower():
                 pos = token.pos_
@@ -480,7 +473,7 @@ def lemmatize_with_normalization(sentence: str, target_word: str) -> Optional[Tu
     """
     try:
         # 先尝试用 spaCy 获取词性
-        doc = nlp(sentence)
+        doc = get_nlp()(sentence)
         pos = None
         for token in doc:
             if token.text.lower() == target_word.lower():
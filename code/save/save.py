@@ -45,8 +45,9 @@ def save_dict_list(data, folder="./saved"):
     """保存 dict list 到本地，文件名是今天的日期"""
     os.makedirs(folder, exist_ok=True)
     filename = os.path.join(folder, f"{date.today().isoformat()}.json")
+    # 先在内存中序列化，再一次性 write，避免 json.dump 的大量小块写入
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(json.dumps(data, ensure_ascii=False, indent=2))
     return filename
 
 
@@ -62,6 +62,14 @@ def get_csv_info(csv_paths:list) -> list[dict]:
     for csv_path in csv_paths:
         df = pandas.read_csv(csv_path)
         words = df.to_dict(orient='records')
+        # 读入时就去掉 text/notes 两边的空白，后续模块不必再逐行清洗
+        for word in words:
+            text = word.get('text')
+            if isinstance(text, str):
+                word['text'] = text.strip()
+            notes = word.get('notes')
+            if isinstance(notes, str):
+                word['notes'] = notes.strip()
         all_words.extend(words)
     return all_words
 